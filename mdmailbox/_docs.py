@@ -50,6 +50,9 @@ Or with uv:
 uv tool install mdmailbox
 ```
 
+Frontmatter is parsed with PyYAML's libyaml bindings when available (the
+PyPI wheels include them); otherwise the pure-Python parser is used.
+
 ## Quick Start
 
 ### 1. Configure credentials
@@ -90,7 +93,7 @@ The email is sent and moved to `~/Mdmailbox/sent/`.
 
 | Command | Description |
 |---------|-------------|
-| `mdmailbox send <file>` | Send an email |
+| `mdmailbox send <file>...` | Send one or more emails |
 | `mdmailbox send --dry-run <file>` | Validate without sending |
 | `mdmailbox import` | Import emails from Maildir |
 | `mdmailbox new` | Create a new email draft |
@@ -102,11 +105,17 @@ The email is sent and moved to `~/Mdmailbox/sent/`.
 # Send an email
 mdmailbox send ~/Mdmailbox/drafts/hello.md
 
+# Send several drafts over one SMTP connection
+mdmailbox send --yes ~/Mdmailbox/drafts/*.md
+
 # Dry run (validate without sending)
 mdmailbox send --dry-run ~/Mdmailbox/drafts/hello.md
 
 # Use custom authinfo file
 mdmailbox send --authinfo ~/secrets/.authinfo ~/Mdmailbox/drafts/hello.md
+
+# Use implicit TLS (SMTPS) instead of STARTTLS
+mdmailbox send --port 465 ~/Mdmailbox/drafts/hello.md
 ```
 
 ### Import from Maildir
@@ -125,6 +134,12 @@ mdmailbox import -o ~/Mdmailbox/inbox
 
 # Limit number of emails
 mdmailbox import -n 100
+
+# Limit parallel parser workers (default: CPU count)
+mdmailbox import -j 4
+
+# fsync every imported file (crash-safe, but much slower on real disks)
+mdmailbox import --fsync
 ```
 
 ### New Draft
@@ -1,11 +1,15 @@
 """Parse .authinfo / .netrc files for email credentials."""
 
+from collections.abc import Iterable
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+import mmap
 import os
+import stat
 
 
-@dataclass
+@dataclass(slots=True)
 class Credential:
     """SMTP credential entry."""
     machine: str  # SMTP host
@@ -13,29 +17,92 @@ class Credential:
     password: str
 
 
+def default_authinfo_path() -> Path:
+    """Return the default .authinfo path: $AUTHINFO_FILE or ~/.authinfo."""
+    if env_path := os.environ.get("AUTHINFO_FILE"):
+        return Path(env_path).expanduser()
+    return Path.home() / ".authinfo"
+
+
+_GMAIL_DOMAINS = frozenset(("gmail.com", "googlemail.com"))
+_DROP_DOTS = str.maketrans("", "", ".")
+
+
 def normalize_gmail(email: str) -> str:
     """Normalize Gmail address for matching.
 
     Gmail ignores dots and everything after + in the local part.
     e.g., h.hartmann+news@gmail.com -> hhartmann@gmail.com
     """
-    if "@" not in email:
+    local, sep, domain = email.lower().rpartition("@")
+    if not sep:
         return email
 
-    local, domain = email.rsplit("@", 1)
-
     # Only normalize gmail addresses
-    if domain.lower() not in ("gmail.com", "googlemail.com"):
-        return email.lower()
+    if domain not in _GMAIL_DOMAINS:
+        return f"{local}@{domain}"
 
-    # Remove everything after +
-    if "+" in local:
-        local = local.split("+")[0]
+    # Drop the +suffix, then the dots
+    local = local.partition("+")[0].translate(_DROP_DOTS)
+    return f"{local}@{domain}"
 
-    # Remove dots
-    local = local.replace(".", "")
 
-    return f"{local}@{domain}".lower()
+# Recognized .authinfo keys; other key/value pairs are skipped
+_KEYS = frozenset(("machine", "login", "password", "port"))
+_REQUIRED_KEYS = frozenset(("machine", "login", "password"))
+
+
+@dataclass(slots=True, frozen=True)
+class _Authinfo:
+    """Parsed .authinfo contents with lookup indexes.
+
+    Index values list credentials in file order, since a login usually
+    appears once per server (e.g. for SMTP and IMAP).
+    """
+
+    credentials: tuple[Credential, ...]
+    by_login: dict[str, list[Credential]]
+    by_normalized: dict[str, list[Credential]]  # keyed by normalize_gmail(login)
+    by_domain: dict[str, list[Credential]]  # *@domain logins, keyed by domain
+
+
+@lru_cache(maxsize=32)
+def _load_cached(path: str, mtime_ns: int, size: int) -> _Authinfo:
+    """Parse and index an .authinfo file; cached per (path, mtime, size)."""
+    return _index(_parse_authinfo_file(Path(path)))
+
+
+def _index(credentials: list[Credential]) -> _Authinfo:
+    """Build the lookup indexes for a list of credentials."""
+    by_login: dict[str, list[Credential]] = {}
+    by_normalized: dict[str, list[Credential]] = {}
+    by_domain: dict[str, list[Credential]] = {}
+    for cred in credentials:
+        by_login.setdefault(cred.login, []).append(cred)
+        by_normalized.setdefault(normalize_gmail(cred.login), []).append(cred)
+        if cred.login.startswith("*@"):
+            by_domain.setdefault(cred.login[2:].lower(), []).append(cred)
+
+    return _Authinfo(tuple(credentials), by_login, by_normalized, by_domain)
+
+
+def _load(path: Path) -> _Authinfo:
+    """Return the parsed file, re-parsing only when its mtime or size changes.
+
+    Pipes and other non-regular files are read fresh on every call: their
+    stat says nothing about their contents, and /dev/fd paths don't resolve.
+    """
+    st = path.stat()
+    if not stat.S_ISREG(st.st_mode):
+        return _index(_parse_authinfo_file(path))
+    return _load_cached(str(path.resolve()), st.st_mtime_ns, st.st_size)
+
+
+def _first(candidates: list[Credential], machine: str | None) -> Credential | None:
+    """Return the first candidate, restricted to machine if given."""
+    if not machine:
+        return candidates[0] if candidates else None
+    return next((c for c in candidates if c.machine == machine), None)
 
 
 def parse_authinfo(path: Path) -> list[Credential]:
@@ -43,29 +110,57 @@ def parse_authinfo(path: Path) -> list[Credential]:
 
     Format: machine <host> login <user> password <pass>
     One entry per line. Lines starting with # are comments.
+    Results are cached until the file changes.
+    """
+    return list(_load(path).credentials)
+
+
+def _parse_authinfo_file(path: Path) -> list[Credential]:
+    """Read and tokenize an .authinfo file (uncached).
+
+    Regular files are memory-mapped and scanned as bytes; only the tokens
+    that end up in a Credential are decoded. Pipes and other non-regular
+    files (e.g. `--authinfo <(gpg -d ~/.authinfo.gpg)`) are streamed.
     """
+    with path.open("rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            # mmap can't map pipes or empty files
+            return _parse_lines(f)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_lines(iter(mm.readline, b""))
+
+
+def _parse_lines(lines: Iterable[bytes]) -> list[Credential]:
+    """Parse raw .authinfo lines into credentials."""
     credentials = []
-    text = path.read_text()
 
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith(b"#"):
             continue
 
         parts = line.split()
-        entry = {}
-
-        # Parse key-value pairs
-        i = 0
-        while i < len(parts) - 1:
-            key = parts[i]
-            if key in ("machine", "login", "password", "port"):
-                entry[key] = parts[i + 1]
-                i += 2
-            else:
-                i += 1
-
-        if "machine" in entry and "login" in entry and "password" in entry:
+
+        # Fast path for the canonical "machine H login U password P" line
+        if (
+            len(parts) == 6
+            and parts[0] == b"machine"
+            and parts[2] == b"login"
+            and parts[4] == b"password"
+        ):
+            credentials.append(Credential(
+                parts[1].decode("utf-8"),
+                parts[3].decode("utf-8"),
+                parts[5].decode("utf-8"),
+            ))
+            continue
+
+        # Parse key-value pairs, consuming tokens two at a time
+        it = iter(line.decode("utf-8").split())
+        entry = {k: v for k, v in zip(it, it) if k in _KEYS}
+
+        if _REQUIRED_KEYS <= entry.keys():
             credentials.append(Credential(
                 machine=entry["machine"],
                 login=entry["login"],
@@ -107,35 +202,24 @@ def find_credential_by_email(
     Returns:
         Credential if found, None otherwise
     """
-    if path is None:
-        if env_path := os.environ.get("AUTHINFO_FILE"):
-            path = Path(env_path).expanduser()
-        else:
-            path = Path.home() / ".authinfo"
+    path = path or default_authinfo_path()
 
     if not path.exists():
         return None
 
-    credentials = parse_authinfo(path)
-    normalized_email = normalize_gmail(email)
-
-    # Filter by machine if provided
-    if machine:
-        credentials = [c for c in credentials if c.machine == machine]
+    authinfo = _load(path)
 
     # First try exact match
-    for cred in credentials:
-        if cred.login == email:
-            return cred
+    if cred := _first(authinfo.by_login.get(email, []), machine):
+        return cred
 
     # Then try normalized match (for Gmail)
-    for cred in credentials:
-        if normalize_gmail(cred.login) == normalized_email:
-            return cred
+    normalized = authinfo.by_normalized.get(normalize_gmail(email), [])
+    if cred := _first(normalized, machine):
+        return cred
 
     # Then try wildcard domain match (*@domain.com)
-    for cred in credentials:
-        if matches_wildcard(cred.login, email):
-            return cred
-
-    return None
+    _, sep, domain = email.rpartition("@")
+    if not sep:
+        return None
+    return _first(authinfo.by_domain.get(domain.lower(), []), machine)
@@ -1,54 +1,92 @@
-"""Command-line interface for mdmailbox."""
+"""Command-line interface for mdmailbox.
+
+Library modules are imported inside the commands that use them, so that
+`--help`, `--version` and shell completion don't pay for smtplib, yaml
+and the email package.
+"""
+
+from __future__ import annotations
 
 from pathlib import Path
 from datetime import datetime
+from typing import TYPE_CHECKING
 import os
 import click
 
-from .email import Email
-from .importer import sanitize_filename
-from .smtp import send_email, SendResult
-from .authinfo import parse_authinfo, find_credential_by_email
-from .importer import import_maildir
+if TYPE_CHECKING:
+    from .email import Email
+    from .smtp import SendResult, SmtpSession
+
+
+def _reserve_unique(directory: Path, stem: str, ext: str = ".md") -> Path:
+    """Atomically create an empty file named <stem><ext> or <stem>-<n><ext>.
+
+    Uses O_CREAT|O_EXCL so that each probe is a single syscall and two
+    concurrent callers can never pick the same name. The caller overwrites
+    the placeholder with the real content.
+    """
+    candidate = directory / f"{stem}{ext}"
+    i = 1
+    while True:
+        try:
+            fd = os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        except FileExistsError:
+            candidate = directory / f"{stem}-{i}{ext}"
+            i += 1
+            continue
+        os.close(fd)
+        return candidate
+
+
+# Escapes for YAML double-quoted scalars: backslash, quote and every C0
+# control character (newlines, tabs, ...)
+_YAML_ESCAPES = {
+    **{c: f"\\x{c:02x}" for c in range(0x20)},
+    ord("\n"): "\\n",
+    ord("\r"): "\\r",
+    ord("\t"): "\\t",
+    ord("\\"): "\\\\",
+    ord('"'): '\\"',
+}
+
+
+def _yaml_str(s: str) -> str:
+    """Format s as a double-quoted YAML scalar.
+
+    Always quoted, so values like "250", "true" or "-" stay strings.
+    """
+    return f'"{s.translate(_YAML_ESCAPES)}"'
 
 
 def _save_with_audit_trail(email: Email, path: Path, result: SendResult) -> None:
     """Save email to file with audit trail appended.
 
     The audit trail is a second YAML section at the end of the file
-    containing send metadata and a verbose log.
+    containing send metadata and a verbose log. Email and trail are
+    written through a single file handle, so the file never exists
+    without its trail.
     """
-    # First save the email normally
-    email.save(path)
-
-    # Now append the audit trail
-    audit_lines = [
-        "",
-        "---",
-        "# Send Log",
-    ]
-
-    if result.sent_at:
-        audit_lines.append(f"sent-at: {result.sent_at.isoformat()}")
-    if result.smtp_host:
-        audit_lines.append(f"smtp-host: {result.smtp_host}")
-    if result.smtp_port:
-        audit_lines.append(f"smtp-port: {result.smtp_port}")
-    if result.smtp_response:
-        # Quote the response in case it has special chars
-        audit_lines.append(f'smtp-response: "{result.smtp_response}"')
-
-    audit_lines.append("---")
-    audit_lines.append("")
-
-    # Add the log entries
-    for log_line in result.log:
-        audit_lines.append(log_line)
-
-    # Append to file
-    with open(path, "a") as f:
-        f.write("\n".join(audit_lines))
-        f.write("\n")
+    with open(path, "w", buffering=64 * 1024) as f:
+        f.write(email.to_string())
+
+        # Now the audit trail
+        f.write("\n---\n# Send Log\n")
+
+        if result.sent_at:
+            f.write(f"sent-at: {result.sent_at.isoformat()}\n")
+        if result.smtp_host:
+            f.write(f"smtp-host: {_yaml_str(result.smtp_host)}\n")
+        if result.smtp_port:
+            f.write(f"smtp-port: {result.smtp_port}\n")
+        if result.smtp_response:
+            f.write(f"smtp-response: {_yaml_str(result.smtp_response)}\n")
+
+        f.write("---\n\n")
+
+        # Add the log entries
+        f.writelines(f"{log_line}\n" for log_line in result.log)
+
+    email.source_path = path
 
 
 def _get_readme_content() -> str:
@@ -295,7 +333,9 @@ def _format_validation_preview(email: Email, validation_result) -> str:
 
 
 @main.command()
-@click.argument("file", type=click.Path(exists=True, path_type=Path))
+@click.argument(
+    "files", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path)
+)
 @click.option(
     "--authinfo",
     type=click.Path(exists=True, path_type=Path),
@@ -316,7 +356,7 @@ def _format_validation_preview(email: Email, validation_result) -> str:
     "--force",
     "-f",
     is_flag=True,
-    help="Skip all validation, send as-is. For emergency use.",
+    help="Skip validation (except required headers). For emergency use.",
 )
 @click.option(
     "--port",
@@ -329,22 +369,63 @@ def _format_validation_preview(email: Email, validation_result) -> str:
     is_flag=True,
     help="Disable STARTTLS (for testing only)",
 )
+@click.option(
+    "--ssl",
+    "use_ssl",
+    is_flag=True,
+    help="Use implicit TLS (SMTPS, usually port 465; implied by --port 465)",
+)
 def send(
-    file: Path,
+    files: tuple[Path, ...],
     authinfo: Path | None,
     dry_run: bool,
     yes: bool,
     force: bool,
     port: int,
     no_tls: bool,
+    use_ssl: bool,
 ):
-    """Send an email file.
+    """Send one or more email files.
 
-    FILE is a path to an email file with YAML frontmatter.
+    FILES are paths to email files with YAML frontmatter. They are sent in
+    order, reusing one SMTP connection per server.
 
     By default, validates and shows a preview before prompting for confirmation.
     Use --yes to auto-confirm (still validates), or --force to skip validation.
     """
+    from .smtp import SmtpSession
+
+    with SmtpSession() as session:
+        for file in files:
+            _send_file(
+                file,
+                session,
+                authinfo=authinfo,
+                dry_run=dry_run,
+                yes=yes,
+                force=force,
+                port=port,
+                no_tls=no_tls,
+                use_ssl=use_ssl,
+            )
+
+
+def _send_file(
+    file: Path,
+    session: SmtpSession,
+    *,
+    authinfo: Path | None,
+    dry_run: bool,
+    yes: bool,
+    force: bool,
+    port: int,
+    no_tls: bool,
+    use_ssl: bool,
+) -> None:
+    """Validate, confirm, send and move a single email file."""
+    from .email import Email
+    from .importer import sanitize_filename
+    from .smtp import send_email
     from .validate import validate_email_string, ValidationContext
 
     # Load file content
@@ -356,9 +437,15 @@ def send(
     except Exception as e:
         raise click.ClickException(f"Failed to parse email: {e}")
 
-    # Skip validation if --force
+    # Skip validation if --force, but never send without required headers
     if force:
         click.echo("⚠ Skipping validation (--force)", err=True)
+        required = (("from_addr", "from"), ("to", "to"), ("subject", "subject"))
+        missing = [label for attr, label in required if not getattr(email, attr)]
+        if missing:
+            raise click.ClickException(
+                f"Missing required headers: {', '.join(missing)}"
+            )
     else:
         # Run validation
         ctx = ValidationContext(authinfo_path=authinfo)
@@ -385,7 +472,14 @@ def send(
                 return
 
     # Send
-    result = send_email(email, authinfo_path=authinfo, port=port, use_tls=not no_tls)
+    result = send_email(
+        email,
+        authinfo_path=authinfo,
+        port=port,
+        use_tls=not no_tls,
+        use_ssl=use_ssl,
+        session=session,
+    )
 
     if result.success:
         # Update email with message-id and date from send
@@ -400,16 +494,9 @@ def send(
         # Generate sent filename with timestamp
         now = datetime.now()
         subject_slug = sanitize_filename(email.subject, max_len=40)
-        sent_filename = f"{now.strftime('%Y-%m-%d')}-{subject_slug}.md"
-        sent_path = sent_dir / sent_filename
-
-        # Avoid overwriting
-        if sent_path.exists():
-            i = 1
-            stem = sent_path.stem
-            while sent_path.exists():
-                sent_path = sent_dir / f"{stem}-{i}.md"
-                i += 1
+        sent_path = _reserve_unique(
+            sent_dir, f"{now.strftime('%Y-%m-%d')}-{subject_slug}"
+        )
 
         # Save email with audit trail appended
         _save_with_audit_trail(email, sent_path, result)
@@ -452,10 +539,29 @@ def send(
     "--account",
     help="Account name (auto-detected from path if not specified)",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parallel parser workers (default: CPU count)",
+)
+@click.option(
+    "--fsync",
+    is_flag=True,
+    help="Flush each imported file to disk (durable, but much slower)",
+)
 def import_cmd(
-    maildir: Path, output: Path | None, limit: int | None, account: str | None
+    maildir: Path,
+    output: Path | None,
+    limit: int | None,
+    account: str | None,
+    jobs: int | None,
+    fsync: bool,
 ):
     """Import emails from Maildir to mdmailbox format."""
+    from .importer import import_maildir
+
     if output is None:
         output = Path.home() / "Mdmailbox" / "inbox"
 
@@ -469,6 +575,8 @@ def import_cmd(
         output_dir=output,
         account=account,
         limit=limit,
+        jobs=jobs,
+        fsync=fsync,
     )
 
     click.echo(f"Imported {len(created)} emails")
@@ -514,6 +622,9 @@ def new(
     output: Path | None,
 ):
     """Create a new email draft."""
+    from .email import Email
+    from .importer import sanitize_filename
+
     drafts_dir = Path.home() / "Mdmailbox" / "drafts"
     drafts_dir.mkdir(parents=True, exist_ok=True)
 
@@ -540,20 +651,12 @@ def new(
     if output is None:
         if subject:
             # Sanitize subject for filename
-            from .importer import sanitize_filename
-
-            filename = sanitize_filename(subject, max_len=50) + ".md"
+            stem = sanitize_filename(subject, max_len=50)
         else:
-            filename = "new-draft.md"
-        output = drafts_dir / filename
+            stem = "new-draft"
 
         # Avoid overwriting
-        if output.exists():
-            i = 1
-            stem = output.stem
-            while output.exists():
-                output = drafts_dir / f"{stem}-{i}.md"
-                i += 1
+        output = _reserve_unique(drafts_dir, stem)
 
     output.parent.mkdir(parents=True, exist_ok=True)
     email.save(output)
@@ -573,12 +676,13 @@ def new(
 )
 def credentials(authinfo: Path | None, email: str | None):
     """Show configured credentials (passwords masked)."""
-    # Resolve authinfo path
-    if authinfo is None:
-        if env_path := os.environ.get("AUTHINFO_FILE"):
-            authinfo = Path(env_path).expanduser()
-        else:
-            authinfo = Path.home() / ".authinfo"
+    from .authinfo import (
+        default_authinfo_path,
+        find_credential_by_email,
+        parse_authinfo,
+    )
+
+    authinfo = authinfo or default_authinfo_path()
 
     if not authinfo.exists():
         raise click.ClickException(f"Authinfo file not found: {authinfo}")
@@ -623,6 +727,9 @@ def reply(file: Path, output: Path | None):
 
     FILE is a path to an email file to reply to.
     """
+    from .email import Email
+    from .importer import sanitize_filename
+
     # Load original email
     try:
         original = Email.from_file(file)
@@ -677,16 +784,9 @@ def reply(file: Path, output: Path | None):
     # Determine output path
     if output is None:
         subject_slug = sanitize_filename(subject, max_len=50)
-        filename = f"{subject_slug}.md"
-        output = drafts_dir / filename
 
         # Avoid overwriting
-        if output.exists():
-            i = 1
-            stem = output.stem
-            while output.exists():
-                output = drafts_dir / f"{stem}-{i}.md"
-                i += 1
+        output = _reserve_unique(drafts_dir, subject_slug)
 
     output.parent.mkdir(parents=True, exist_ok=True)
     email.save(output)
@@ -1,13 +1,106 @@
 """Email class - parse and serialize YAML frontmatter emails."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
 from email.message import EmailMessage
-from email.utils import formatdate, make_msgid, parseaddr
+from email.utils import formatdate, parseaddr
+import re
+import secrets
+import socket
+import sys
 import yaml
 
+# Parse with libyaml when PyYAML was built with it. Dumping stays on the
+# pure-Python SafeDumper: libyaml escapes characters outside the BMP (e.g.
+# emoji) even with allow_unicode=True, which would make files hard to edit.
+from yaml import SafeDumper
 
-@dataclass
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+# Fallback splitter for frontmatter the plain string search can't handle
+# (CRLF line endings, trailing whitespace after ---, closing --- at EOF)
+_FRONTMATTER_RE = re.compile(
+    r"---[ \t]*\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n|\Z)(.*)", re.DOTALL
+)
+
+
+def split_frontmatter(text: str) -> tuple[str, str]:
+    """Split text into (frontmatter, body) around the --- delimiters.
+
+    Neither part is stripped. Raises ValueError if no closing --- is found.
+    """
+    # Common well-formed case: plain string search, no regex engine. Only
+    # valid if no earlier line starts with --- (e.g. a closing "--- " with
+    # trailing whitespace, before a later "---" rule in the body).
+    if text.startswith("---\n"):
+        end = text.find("\n---\n", 3)
+        if end != -1:
+            frontmatter = text[4:end]
+            if "\n---" not in frontmatter and not frontmatter.startswith("---"):
+                return frontmatter, text[end + 5:]
+
+    if m := _FRONTMATTER_RE.match(text):
+        return m.group(1), m.group(2)
+
+    raise ValueError("Invalid frontmatter format")
+
+
+@lru_cache(maxsize=1)
+def _fqdn() -> str:
+    """Return this host's FQDN, looked up once (it may hit DNS)."""
+    return socket.getfqdn() or "localhost"
+
+
+def _intern(value):
+    """Intern a string header value; other YAML types pass through.
+
+    Loaded mailboxes repeat the same few correspondents and accounts, so
+    Emails kept in memory share one copy of each address.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_all(values):
+    """Intern each string in a list of addresses; non-lists pass through.
+
+    A blank key such as `cc:` loads as None and is left for validation.
+    """
+    if not isinstance(values, list):
+        return values
+    return [_intern(v) for v in values]
+
+
+def _set_unstructured(msg: EmailMessage, name: str, value) -> None:
+    """Add a free-text header, skipping the policy's parse when it is a no-op.
+
+    Short single-line ASCII values serialize the same either way, so they
+    are stored raw and only parsed if the header is read back. Anything
+    else goes through the policy, which encodes and folds it.
+    """
+    if (
+        type(value) is str
+        and value
+        and value.isascii()
+        and "\r" not in value
+        and "\n" not in value
+        and "=?" not in value  # the policy decodes RFC 2047 encoded words
+        and len(name) + len(value) <= 76  # "Name: value" within 78 columns
+    ):
+        msg.set_raw(name, value)
+    else:
+        msg[name] = value
+
+
+def _make_msgid() -> str:
+    """Generate a Message-ID without email.utils.make_msgid's per-call FQDN lookup."""
+    return f"<{secrets.token_urlsafe(16)}@{_fqdn()}>"
+
+
+@dataclass(slots=True)
 class Email:
     """An email with YAML frontmatter headers and body content."""
 
@@ -41,12 +134,23 @@ class Email:
 
     @classmethod
     def from_file(cls, path: Path | str) -> "Email":
-        """Load email from a file with YAML frontmatter."""
+        """Load email from a file with YAML frontmatter.
+
+        Parsed files are cached until their mtime or size changes; each call
+        returns a fresh copy that is safe to modify.
+        """
         path = Path(path)
-        text = path.read_text()
-        email = cls.from_string(text)
-        email.source_path = path
-        return email
+        st = path.stat()
+        cached = _from_file_cached(cls, str(path.resolve()), st.st_mtime_ns, st.st_size)
+        return replace(
+            cached,
+            to=_copy_list(cached.to),
+            cc=_copy_list(cached.cc),
+            bcc=_copy_list(cached.bcc),
+            references=_copy_list(cached.references),
+            attachments=_copy_list(cached.attachments),
+            source_path=path,
+        )
 
     @classmethod
     def from_string(cls, text: str) -> "Email":
@@ -55,14 +159,11 @@ class Email:
             raise ValueError("Email must start with YAML frontmatter (---)")
 
         # Split frontmatter and body
-        parts = text.split("---", 2)
-        if len(parts) < 3:
-            raise ValueError("Invalid frontmatter format")
-
-        frontmatter = parts[1].strip()
-        body = parts[2].strip()
+        frontmatter, body = split_frontmatter(text)
+        frontmatter = frontmatter.strip()
+        body = body.strip()
 
-        headers = yaml.safe_load(frontmatter)
+        headers = yaml.load(frontmatter, Loader=SafeLoader)
         if not headers:
             headers = {}
 
@@ -92,19 +193,19 @@ class Email:
             attachments = [attachments]
 
         return cls(
-            from_addr=headers.get("from", ""),
-            to=to,
+            from_addr=_intern(headers.get("from", "")),
+            to=_intern_all(to),
             subject=headers.get("subject", ""),
             body=body,
-            cc=cc,
-            bcc=bcc,
+            cc=_intern_all(cc),
+            bcc=_intern_all(bcc),
             reply_to=headers.get("reply-to"),
             message_id=headers.get("message-id"),
             date=headers.get("date"),
             in_reply_to=headers.get("in-reply-to"),
             references=references,
             attachments=attachments,
-            account=headers.get("account"),
+            account=_intern(headers.get("account")),
             original_hash=headers.get("original-hash"),
         )
 
@@ -114,9 +215,11 @@ class Email:
 
         msg = EmailMessage()
 
+        # Address headers always go through the policy, which repairs
+        # malformed addresses; smtplib parses them again while sending
         msg["From"] = self.from_addr
         msg["To"] = ", ".join(self.to)
-        msg["Subject"] = self.subject
+        _set_unstructured(msg, "Subject", self.subject)
 
         if self.cc:
             msg["Cc"] = ", ".join(self.cc)
@@ -125,16 +228,23 @@ class Email:
             msg["Reply-To"] = self.reply_to
 
         if self.in_reply_to:
-            msg["In-Reply-To"] = self.in_reply_to
+            _set_unstructured(msg, "In-Reply-To", self.in_reply_to)
 
         if self.references:
-            msg["References"] = " ".join(self.references)
+            _set_unstructured(msg, "References", " ".join(self.references))
 
-        # Generate message-id if not present
-        msg["Message-ID"] = self.message_id or make_msgid()
+        # Generate message-id if not present. Given ids and dates go through
+        # the policy, which normalizes them; generated ones are canonical.
+        if self.message_id:
+            msg["Message-ID"] = self.message_id
+        else:
+            msg.set_raw("Message-ID", _make_msgid())
 
         # Use current date if not specified
-        msg["Date"] = self.date or formatdate(localtime=True)
+        if self.date:
+            msg["Date"] = self.date
+        else:
+            msg.set_raw("Date", formatdate(localtime=True))
 
         # Set body text
         msg.set_content(self.body)
@@ -167,6 +277,19 @@ class Email:
 
     def to_string(self) -> str:
         """Serialize back to YAML frontmatter format."""
+        return f"---\n{self._frontmatter()}---\n\n{self.body}\n"
+
+    def to_parts(self) -> list[bytes]:
+        """Serialize to UTF-8 fragments that concatenate to to_string().
+
+        Lets writers hand the pieces to os.writev instead of first joining
+        them into one copy of a possibly large body.
+        """
+        frontmatter = self._frontmatter().encode()
+        return [b"---\n", frontmatter, b"---\n\n", self.body.encode(), b"\n"]
+
+    def _frontmatter(self) -> str:
+        """Render the headers as a YAML document (without the --- delimiters)."""
         headers = {
             "from": self.from_addr,
             "to": self.to if len(self.to) > 1 else self.to[0] if self.to else "",
@@ -197,8 +320,9 @@ class Email:
         if self.original_hash:
             headers["original-hash"] = self.original_hash
 
-        frontmatter = yaml.dump(headers, default_flow_style=False, allow_unicode=True)
-        return f"---\n{frontmatter}---\n\n{self.body}\n"
+        return yaml.dump(
+            headers, Dumper=SafeDumper, default_flow_style=False, allow_unicode=True
+        )
 
     def save(self, path: Path | str | None = None) -> None:
         """Save email to file."""
@@ -207,3 +331,14 @@ class Email:
             raise ValueError("No path specified and no source path set")
         path.write_text(self.to_string())
         self.source_path = path
+
+
+def _copy_list(value):
+    """Copy a list field; other values (e.g. None from a blank `to:`) pass through."""
+    return list(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=128)
+def _from_file_cached(cls: type[Email], path: str, mtime_ns: int, size: int) -> Email:
+    """Parse an email file; cached per (path, mtime, size). Never hand out directly."""
+    return cls.from_string(Path(path).read_text())
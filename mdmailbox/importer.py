@@ -1,18 +1,40 @@
 """Import emails from Maildir (RFC822) to mdmail YAML format."""
 
-import re
 import hashlib
+import itertools
+import os
+import string
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
 from email import policy
-from email.parser import BytesParser
+from email.parser import BytesFeedParser
 from email.utils import parsedate_to_datetime, parseaddr
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass
+from typing import BinaryIO
 
 from .email import Email
 
 
-@dataclass
+# Below this many files, worker process startup outweighs the parse
+# speedup and a thread pool (which still overlaps file reads) is used
+_PROCESS_POOL_MIN_FILES = 64
+
+# Files handed to a worker process per task
+_PARSE_CHUNKSIZE = 32
+
+# Tasks per worker submitted at a time, so parsed results can't pile up
+# ahead of the (slower) writer and hold a whole maildir in memory
+_PARSE_WINDOW_TASKS = 2
+
+# Output files written and fsynced per directory fsync (import --fsync)
+_FSYNC_BATCH = 64
+
+
+@dataclass(slots=True)
 class ImportedEmail:
     """Email with import metadata."""
     email: Email
@@ -20,6 +42,19 @@ class ImportedEmail:
     source_path: Path
 
 
+class _SlugTable(dict):
+    """str.translate table keeping [a-z0-9] and mapping everything else to '-'."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return "-"
+
+
+_SLUG_CHARS = frozenset(string.ascii_lowercase + string.digits)
+_SLUG_TABLE = _SlugTable(
+    {i: chr(i) if chr(i) in _SLUG_CHARS else "-" for i in range(128)}
+)
+
+
 def sanitize_filename(text: str, max_len: int = 40) -> str:
     """Sanitize text for use in filename.
 
@@ -33,12 +68,10 @@ def sanitize_filename(text: str, max_len: int = 40) -> str:
         return "unknown"
 
     # Lowercase and replace non-alphanumeric with hyphens
-    text = text.lower()
-    text = re.sub(r'[^a-z0-9]+', '-', text)
+    text = text.lower().translate(_SLUG_TABLE)
 
     # Collapse multiple hyphens and strip edges
-    text = re.sub(r'-+', '-', text)
-    text = text.strip('-')
+    text = '-'.join(filter(None, text.split('-')))
 
     # Truncate (try to break at hyphen)
     if len(text) > max_len:
@@ -100,14 +133,35 @@ def generate_filename(
     return filename
 
 
-def parse_rfc822(path: Path) -> ImportedEmail:
-    """Parse an RFC822 email file into an Email object with metadata."""
-    raw_bytes = path.read_bytes()
+class _ParserTee:
+    """Binary reader that feeds everything read through it to a parser.
+
+    Lets hashlib.file_digest drive the read loop (and hash straight from its
+    reusable buffer) while the same bytes go to the email parser.
+    """
+
+    def __init__(self, f: BinaryIO, parser: BytesFeedParser):
+        self._f = f
+        self._parser = parser
 
-    # Compute hash of original file
-    original_hash = hashlib.sha256(raw_bytes).hexdigest()
+    def readable(self) -> bool:
+        return True
 
-    msg = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+    def readinto(self, buf) -> int:
+        n = self._f.readinto(buf)
+        if n:
+            self._parser.feed(bytes(memoryview(buf)[:n]))
+        return n
+
+
+def parse_rfc822(path: Path) -> ImportedEmail:
+    """Parse an RFC822 email file into an Email object with metadata."""
+    # Hash and parse in one streaming pass, so the file is read once and
+    # never held in memory as a whole
+    parser = BytesFeedParser(policy=policy.default)
+    with open(path, "rb") as f:
+        original_hash = hashlib.file_digest(_ParserTee(f, parser), "sha256").hexdigest()
+    msg = parser.close()
 
     # Extract headers - convert to plain strings
     from_addr = str(msg['From'] or "")
@@ -189,6 +243,83 @@ def parse_rfc822(path: Path) -> ImportedEmail:
     )
 
 
+def _parse_one(path: Path) -> tuple[ImportedEmail | None, str | None]:
+    """Parse one file in a worker, returning the error message instead of raising."""
+    try:
+        return parse_rfc822(path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _write_all(fd: int, parts: list[bytes]) -> None:
+    """Write all parts to fd with scatter-gather writes, retrying on short writes."""
+    views = [memoryview(p) for p in parts if p]
+    while views:
+        written = os.writev(fd, views)
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if written:
+            views[0] = views[0][written:]
+
+
+def _flush_batch(
+    dir_fd: int | None, entries: list[tuple[Path, list[bytes]]]
+) -> list[Path]:
+    """Write a batch of files; with a dir_fd, make them durable.
+
+    Group commit: each file is written and fsynced, but the directory
+    entry updates for the whole batch share a single fsync. Without a
+    dir_fd nothing is fsynced and the files are left to the page cache.
+    Returns the paths written; failures are reported and skipped.
+    """
+    written: list[Path] = []
+    for path, parts in entries:
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                _write_all(fd, parts)
+                if dir_fd is not None:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"Warning: Failed to write {path}: {e}")
+            continue
+        written.append(path)
+
+    if written and dir_fd is not None:
+        os.fsync(dir_fd)
+    return written
+
+
+def _parse_executor(jobs: int | None, n_files: int) -> Executor | None:
+    """Choose how to parse n_files: None (serial), threads or processes."""
+    if jobs == 1 or n_files < 2:
+        return None
+    if n_files < _PROCESS_POOL_MIN_FILES:
+        return ThreadPoolExecutor(max_workers=jobs)
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+def _map_windowed(
+    executor: Executor, fn: Callable, window: int, *iterables: Iterable
+) -> Iterator:
+    """Like executor.map, but with at most two windows of inputs submitted.
+
+    Executor.map submits every input up front, so results accumulate while
+    the consumer is busy. Here the next window is submitted before the
+    current one is drained, which keeps the workers busy while bounding
+    the number of results held to 2 * window.
+    """
+    in_flight: deque[Iterator] = deque()
+    for batch in itertools.batched(zip(*iterables), window):
+        in_flight.append(executor.map(fn, *zip(*batch), chunksize=_PARSE_CHUNKSIZE))
+        if len(in_flight) > 1:
+            yield from in_flight.popleft()
+    while in_flight:
+        yield from in_flight.popleft()
+
+
 def find_maildir_emails(maildir_root: Path) -> list[Path]:
     """Find all email files in a Maildir structure.
 
@@ -221,19 +352,65 @@ def find_maildir_emails(maildir_root: Path) -> list[Path]:
     return emails
 
 
+def _assign_filename(
+    email: Email, email_path: Path, account: str | None, existing_names: set[str]
+) -> str:
+    """Set the email's account and reserve a unique output filename for it."""
+    # Auto-detect account from path
+    detected_account = account
+    if not detected_account:
+        # Try to extract from path like ~/mail/gmail-hhartmann1729/INBOX/cur/...
+        parts = email_path.parts
+        for i, part in enumerate(parts):
+            if part == 'mail' and i + 1 < len(parts):
+                detected_account = parts[i + 1]
+                break
+
+    email.account = detected_account
+
+    # Parse date for filename
+    date = None
+    if email.date:
+        try:
+            date = datetime.fromisoformat(email.date)
+        except ValueError:
+            pass
+
+    filename = generate_filename(
+        date=date,
+        from_addr=email.from_addr,
+        subject=email.subject,
+        message_id=email.message_id,
+        existing_names=existing_names,
+    )
+
+    existing_names.add(filename)
+    return filename
+
+
 def import_maildir(
     maildir_root: Path,
     output_dir: Path,
     account: str | None = None,
     limit: int | None = None,
+    jobs: int | None = None,
+    fsync: bool = False,
 ) -> list[Path]:
     """Import emails from Maildir to mdmail format.
 
+    Parsing is spread across worker processes (threads for small imports);
+    filename assignment and writing stay in this process so collision
+    handling is deterministic. With fsync, files are written durably in
+    batches that share one directory fsync; this costs a synchronous disk
+    flush per file, so it is off by default.
+
     Args:
         maildir_root: Path to Maildir root (e.g., ~/mail)
         output_dir: Where to write .md files (e.g., ~/.mdmail/inbox)
         account: Account name to set in headers (auto-detected from path if None)
         limit: Max number of emails to import (None for all)
+        jobs: Number of parser workers (None for CPU count, 1 for serial)
+        fsync: fsync each written file and the output directory
 
     Returns:
         List of created file paths
@@ -244,51 +421,48 @@ def import_maildir(
     if limit:
         email_files = email_files[:limit]
 
-    existing_names: set[str] = {f.name for f in output_dir.iterdir() if f.is_file()}
+    # Collision checks run against this in-memory set, filled once; scandir
+    # gets file types from the directory listing instead of a stat per entry
+    with os.scandir(output_dir) as entries:
+        existing_names: set[str] = {e.name for e in entries if e.is_file()}
     created: list[Path] = []
+    pending: list[tuple[Path, list[bytes]]] = []
 
-    for email_path in email_files:
-        try:
-            imported = parse_rfc822(email_path)
-            email = imported.email
-
-            # Auto-detect account from path
-            detected_account = account
-            if not detected_account:
-                # Try to extract from path like ~/mail/gmail-hhartmann1729/INBOX/cur/...
-                parts = email_path.parts
-                for i, part in enumerate(parts):
-                    if part == 'mail' and i + 1 < len(parts):
-                        detected_account = parts[i + 1]
-                        break
-
-            email.account = detected_account
-
-            # Parse date for filename
-            date = None
-            if email.date:
-                try:
-                    date = datetime.fromisoformat(email.date)
-                except ValueError:
-                    pass
+    executor = _parse_executor(jobs, len(email_files))
+    dir_fd = os.open(output_dir, os.O_RDONLY | os.O_DIRECTORY) if fsync else None
 
-            filename = generate_filename(
-                date=date,
-                from_addr=email.from_addr,
-                subject=email.subject,
-                message_id=email.message_id,
-                existing_names=existing_names,
-            )
+    try:
+        with executor or nullcontext():
+            if executor:
+                workers = jobs or os.cpu_count() or 1
+                window = workers * _PARSE_CHUNKSIZE * _PARSE_WINDOW_TASKS
+                parsed = _map_windowed(executor, _parse_one, window, email_files)
+            else:
+                parsed = map(_parse_one, email_files)
 
-            existing_names.add(filename)
-            output_path = output_dir / filename
+            for email_path, (imported, error) in zip(email_files, parsed):
+                if error is not None:
+                    print(f"Warning: Failed to import {email_path}: {error}")
+                    continue
 
-            email.save(output_path)
-            created.append(output_path)
-
-        except Exception as e:
-            # Skip problematic emails, continue with others
-            print(f"Warning: Failed to import {email_path}: {e}")
-            continue
+                try:
+                    filename = _assign_filename(
+                        imported.email, email_path, account, existing_names
+                    )
+                    parts = imported.email.to_parts()
+                except Exception as e:
+                    # Skip problematic emails, continue with others
+                    print(f"Warning: Failed to import {email_path}: {e}")
+                    continue
+
+                pending.append((output_dir / filename, parts))
+                if len(pending) >= _FSYNC_BATCH:
+                    created.extend(_flush_batch(dir_fd, pending))
+                    pending.clear()
+
+        created.extend(_flush_batch(dir_fd, pending))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
 
     return created
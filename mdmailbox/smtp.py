@@ -1,8 +1,12 @@
 """Email sending via SMTP with automatic IMAP sent folder upload."""
 
+import re
 import smtplib
+from collections.abc import Callable
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
+from email.message import EmailMessage
 from pathlib import Path
 
 from .authinfo import Credential, find_credential_by_email
@@ -10,7 +14,7 @@ from .email import Email
 from .imap import find_imap_credential, upload_to_sent_folder
 
 
-@dataclass
+@dataclass(slots=True)
 class SendResult:
     """Result of sending an email."""
 
@@ -28,12 +32,263 @@ class SendResult:
     log: list[str] = field(default_factory=list)
 
 
+# Lines starting with "." must be doubled inside DATA (RFC 5321 4.5.2)
+_LEADING_DOT_RE = re.compile(rb"(?m)^\.")
+
+
+class _PipeliningMixin:
+    """Send the MAIL/RCPT/DATA envelope in one write when PIPELINING is offered.
+
+    Stock smtplib waits for a reply after every envelope command, costing
+    one round-trip per recipient. With RFC 2920 pipelining the whole
+    envelope goes out in a single write and the replies are read
+    afterwards. If the server also offers CHUNKING (RFC 3030), the message
+    follows the envelope in the same write as a single BDAT LAST chunk,
+    which needs neither the 354 round-trip nor dot-stuffing. Error handling
+    mirrors smtplib.SMTP.sendmail.
+    """
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        if not self.has_extn("pipelining") or not isinstance(msg, bytes):
+            return super().sendmail(
+                from_addr, to_addrs, msg, mail_options, rcpt_options
+            )
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        esmtp_opts = []
+        if self.has_extn("size"):
+            esmtp_opts.append(f"size={len(msg)}")
+        esmtp_opts.extend(mail_options)
+        if any(opt.lower() == "smtputf8" for opt in esmtp_opts):
+            if not self.has_extn("smtputf8"):
+                raise smtplib.SMTPNotSupportedError(
+                    "SMTPUTF8 not supported by server"
+                )
+            self.command_encoding = "utf-8"
+
+        commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{_options(esmtp_opts)}"]
+        commands.extend(
+            f"rcpt TO:{smtplib.quoteaddr(addr)}{_options(rcpt_options)}"
+            for addr in to_addrs
+        )
+        chunking = self.has_extn("chunking")
+        commands.append(f"bdat {len(msg)} last" if chunking else "data")
+        if any("\r" in c or "\n" in c for c in commands):
+            raise ValueError("SMTP command contains prohibited newline characters")
+        envelope = "".join(f"{c}\r\n" for c in commands)
+        envelope = envelope.encode(self.command_encoding)
+        self.send(envelope + msg if chunking else envelope)
+
+        # Read one reply per pipelined command, in order. After a 421 the
+        # server closes the connection, so stop reading and raise what
+        # smtplib.SMTP.sendmail would.
+        mail_code, mail_resp = self.getreply()
+        if mail_code == 421:
+            self.close()
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        senderrs = {}
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code not in (250, 251):
+                senderrs[addr] = (code, resp)
+            if code == 421:
+                self.close()
+                raise smtplib.SMTPRecipientsRefused(senderrs)
+        data_code, data_resp = self.getreply()
+
+        envelope_failed = mail_code != 250 or len(senderrs) == len(to_addrs)
+        if envelope_failed and data_code == 354 and not chunking:
+            # Server accepted DATA anyway; terminate it with an empty body
+            self.send(b".\r\n")
+            self.getreply()
+
+        if mail_code != 250:
+            self._abort(mail_code)
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(senderrs) == len(to_addrs):
+            self._abort(data_code)
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != (250 if chunking else 354):
+            self._abort(data_code)
+            raise smtplib.SMTPDataError(data_code, data_resp)
+        if chunking:
+            return senderrs  # the BDAT reply already confirmed delivery
+
+        data = _LEADING_DOT_RE.sub(b"..", msg)
+        if not data.endswith(b"\r\n"):
+            data += b"\r\n"
+        self.send(data + b".\r\n")
+        code, resp = self.getreply()
+        if code != 250:
+            self._abort(code)
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+    def _abort(self, code: int) -> None:
+        """Reset the transaction after a failure, or close on 421."""
+        if code == 421:
+            self.close()
+            return
+        try:
+            self.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+
+
+def _is_alive(server: smtplib.SMTP) -> bool:
+    """Check an idle connection with NOOP before reusing it."""
+    try:
+        return server.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _options(options) -> str:
+    """Format ESMTP parameters as appended to MAIL/RCPT commands."""
+    return "".join(f" {opt}" for opt in options)
+
+
+class _SMTP(_PipeliningMixin, smtplib.SMTP):
+    """smtplib.SMTP with envelope pipelining."""
+
+
+class _SMTP_SSL(_PipeliningMixin, smtplib.SMTP_SSL):
+    """smtplib.SMTP_SSL with envelope pipelining."""
+
+
+class SmtpSession:
+    """Reusable SMTP connections for sending several emails in one run.
+
+    Connections are opened lazily, keyed by (host, port, login), and kept
+    open so that later messages to the same server skip the connect,
+    STARTTLS and AUTH handshake. All connections are closed on exit:
+
+        with SmtpSession() as session:
+            for email in drafts:
+                result = session.send(email)
+    """
+
+    def __init__(self) -> None:
+        self._conns: dict[tuple[str, int, str], smtplib.SMTP] = {}
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def send(self, email: Email, **kwargs) -> SendResult:
+        """Send an email reusing this session's connections (see send_email)."""
+        return send_email(email, session=self, **kwargs)
+
+    def send_message(
+        self,
+        credential: Credential,
+        port: int,
+        use_tls: bool,
+        mime_msg: EmailMessage,
+        recipients: list[str],
+        log_msg: Callable[[str], None],
+        use_ssl: bool = False,
+    ) -> dict:
+        """Send a MIME message, returning the refused recipients.
+
+        A failed send is never retried: the server may have received the
+        message before the connection dropped, and resending could deliver
+        it twice. Idle connections are checked before reuse instead.
+        """
+        server = self._connect(credential, port, use_tls, use_ssl, log_msg)
+        log_msg(f"Sending message to {len(recipients)} recipient(s)")
+        try:
+            return server.send_message(mime_msg, to_addrs=recipients)
+        except smtplib.SMTPServerDisconnected:
+            self._evict(credential, port)
+            raise
+
+    def close(self) -> None:
+        """Close all open connections."""
+        for server in self._conns.values():
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+        self._conns.clear()
+
+    def _connect(
+        self,
+        credential: Credential,
+        port: int,
+        use_tls: bool,
+        use_ssl: bool,
+        log_msg: Callable[[str], None],
+    ) -> smtplib.SMTP:
+        """Return an open connection for credential.
+
+        A cached connection is probed with NOOP first and replaced if the
+        server has dropped it while idle. Port 465 (or use_ssl) connects with
+        implicit TLS, which saves the plaintext EHLO and STARTTLS round-trips
+        of submission on port 587.
+        """
+        key = (credential.machine, port, credential.login)
+        if server := self._conns.get(key):
+            if _is_alive(server):
+                log_msg(f"Reusing connection to {credential.machine}:{port}")
+                return server
+            log_msg(f"Connection to {credential.machine}:{port} closed, reconnecting")
+            self._evict(credential, port)
+
+        implicit_tls = use_ssl or port == 465
+        log_msg(f"Connecting to {credential.machine}:{port}")
+        if implicit_tls:
+            server = _SMTP_SSL(credential.machine, port)
+        else:
+            server = _SMTP(credential.machine, port)
+        try:
+            server.ehlo()
+            log_msg("EHLO sent")
+
+            if implicit_tls:
+                log_msg("Implicit TLS established")
+            elif use_tls:
+                server.starttls()
+                server.ehlo()  # Re-identify after STARTTLS
+                log_msg("STARTTLS established")
+
+            # Only login if server supports AUTH
+            if server.has_extn("auth"):
+                server.login(credential.login, credential.password)
+                log_msg(f"Authenticated as {credential.login}")
+            else:
+                log_msg("Server does not require authentication")
+
+            if server.has_extn("pipelining"):
+                log_msg("Server supports PIPELINING")
+                if server.has_extn("chunking"):
+                    log_msg("Server supports CHUNKING")
+        except BaseException:
+            server.close()
+            raise
+
+        self._conns[key] = server
+        return server
+
+    def _evict(self, credential: Credential, port: int) -> None:
+        """Drop the connection for credential without sending QUIT."""
+        key = (credential.machine, port, credential.login)
+        if server := self._conns.pop(key, None):
+            server.close()
+
+
 def send_email(
     email: Email,
     credential: Credential | None = None,
     authinfo_path: Path | None = None,
     port: int = 587,
     use_tls: bool = True,
+    session: SmtpSession | None = None,
+    use_ssl: bool = False,
 ) -> SendResult:
     """Send an email via SMTP and upload to IMAP sent folder.
 
@@ -43,6 +298,9 @@ def send_email(
         authinfo_path: Path to .authinfo file (uses default if None)
         port: SMTP port (default 587 for submission with STARTTLS)
         use_tls: Whether to use STARTTLS (default True)
+        use_ssl: Connect with implicit TLS (SMTPS). Implied by port 465.
+        session: SmtpSession to reuse connections from. If None, a
+            connection is opened for this message and closed afterwards.
 
     Returns:
         SendResult with success status, message, IMAP upload status, and audit log
@@ -77,34 +335,17 @@ def send_email(
     mime_msg = email.to_mime()
 
     # Collect all recipients
-    recipients = list(email.to)
-    recipients.extend(email.cc)
-    recipients.extend(email.bcc)
+    recipients = [*email.to, *email.cc, *email.bcc]
     log_msg(f"Recipients: {', '.join(recipients)}")
 
     sent_at = datetime.now().astimezone()
     smtp_response = None
 
     try:
-        log_msg(f"Connecting to {credential.machine}:{port}")
-        with smtplib.SMTP(credential.machine, port) as server:
-            server.ehlo()
-            log_msg("EHLO sent")
-
-            if use_tls:
-                server.starttls()
-                server.ehlo()  # Re-identify after STARTTLS
-                log_msg("STARTTLS established")
-
-            # Only login if server supports AUTH
-            if server.has_extn("auth"):
-                server.login(credential.login, credential.password)
-                log_msg(f"Authenticated as {credential.login}")
-            else:
-                log_msg("Server does not require authentication")
-
-            log_msg(f"Sending message to {len(recipients)} recipient(s)")
-            send_errors = server.send_message(mime_msg, to_addrs=recipients)
+        with nullcontext(session) if session else SmtpSession() as smtp:
+            send_errors = smtp.send_message(
+                credential, port, use_tls, mime_msg, recipients, log_msg, use_ssl
+            )
 
             # send_message returns {} on success, dict of failed recipients on partial failure
             if send_errors:
@@ -359,7 +359,7 @@ def validate_email_string(
     This is the main entry point for validation - takes raw markdown,
     parses it, and validates all fields.
     """
-    from .email import Email
+    from .email import Email, SafeLoader, split_frontmatter
 
     ctx = ctx or ValidationContext()
     result = ValidationResult()
@@ -374,11 +374,8 @@ def validate_email_string(
     # Get raw headers from YAML for unknown header detection
     import yaml
 
-    parts = content.split("---", 2)
-    if len(parts) >= 3:
-        raw_headers = yaml.safe_load(parts[1].strip()) or {}
-    else:
-        raw_headers = {}
+    frontmatter, _ = split_frontmatter(content)
+    raw_headers = yaml.load(frontmatter, Loader=SafeLoader) or {}
 
     # Check for unknown headers
     for header in raw_headers.keys():
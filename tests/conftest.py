@@ -13,3 +13,98 @@ def smtpd_use_starttls():
 def smtpd_enforce_auth():
     """Disable authentication enforcement for testing."""
     return False
+
+
+class _PipeliningHandler:
+    """aiosmtpd handler that advertises PIPELINING and refuses one recipient."""
+
+    refused = "refused@example.com"
+    shutting_down = "shutdown@example.com"  # answered with 421
+
+    def __init__(self):
+        self.envelopes = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        return [*responses[:-1], "250-PIPELINING", responses[-1]]
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == self.refused:
+            return "550 No such user"
+        if address == self.shutting_down:
+            return "421 Service shutting down"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+@pytest.fixture
+def pipelining_smtpd():
+    """Local SMTP server that advertises PIPELINING (smtpdfix does not)."""
+    import portpicker
+    from aiosmtpd.controller import Controller
+
+    handler = _PipeliningHandler()
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=portpicker.pick_unused_port()
+    )
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+class _ChunkingHandler(_PipeliningHandler):
+    """_PipeliningHandler that also advertises CHUNKING."""
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        responses = await super().handle_EHLO(
+            server, session, envelope, hostname, responses
+        )
+        return [*responses[:-1], "250-CHUNKING", responses[-1]]
+
+
+def _chunking_server_class():
+    """aiosmtpd SMTP server with a minimal BDAT (RFC 3030) implementation."""
+    from aiosmtpd.smtp import SMTP
+
+    class ChunkingSMTP(SMTP):
+        async def smtp_BDAT(self, arg):
+            size, _, last = arg.partition(" ")
+            data = await self._reader.readexactly(int(size))
+            self.bdat_commands = getattr(self, "bdat_commands", 0) + 1
+            if not self.envelope.rcpt_tos:
+                await self.push("554 No valid recipients")
+                return
+            assert last.upper() == "LAST"
+            self.envelope.content = self.envelope.original_content = data
+            status = await self._call_handler_hook("DATA")
+            self._set_post_data_state()
+            await self.push(status)
+
+        async def smtp_DATA(self, arg):
+            raise AssertionError("DATA used although CHUNKING is offered")
+
+    return ChunkingSMTP
+
+
+@pytest.fixture
+def chunking_smtpd():
+    """Local SMTP server that advertises PIPELINING and CHUNKING."""
+    import portpicker
+    from aiosmtpd.controller import Controller
+
+    server_class = _chunking_server_class()
+
+    class ChunkingController(Controller):
+        def factory(self):
+            return server_class(self.handler, **self.SMTP_kwargs)
+
+    controller = ChunkingController(
+        _ChunkingHandler(), hostname="127.0.0.1", port=portpicker.pick_unused_port()
+    )
+    controller.start()
+    yield controller
+    controller.stop()
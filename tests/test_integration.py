@@ -1,14 +1,18 @@
 """Integration tests for mdmail using smtpdfix."""
 
+import os
+import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
 from mdmailbox.authinfo import parse_authinfo, find_credential_by_email, Credential
 from mdmailbox.cli import main
 from mdmailbox.email import Email
-from mdmailbox.smtp import send_email
+from mdmailbox.smtp import send_email, SmtpSession
 from mdmailbox.importer import (
     sanitize_filename,
     generate_filename,
@@ -147,6 +151,95 @@ class TestAuthinfo:
         cred = find_credential_by_email("other@example.com", authinfo)
         assert cred.password == "wildcard"
 
+    def test_find_credential_wildcard_with_machine(self, tmp_path):
+        """Test wildcard matching honors the machine filter and domain case."""
+        authinfo = tmp_path / ".authinfo"
+        authinfo.write_text(
+            "machine smtp.example.com login *@Example.com password smtp\n"
+            "machine imap.example.com login *@example.com password imap\n"
+        )
+
+        cred = find_credential_by_email("user@EXAMPLE.com", authinfo)
+        assert cred.password == "smtp"
+
+        cred = find_credential_by_email(
+            "user@example.com", authinfo, machine="imap.example.com"
+        )
+        assert cred.password == "imap"
+
+        cred = find_credential_by_email(
+            "user@example.com", authinfo, machine="other.example.com"
+        )
+        assert cred is None
+
+    def test_parse_empty_and_crlf_files(self, tmp_path):
+        """Test parsing an empty file and one with CRLF endings, no final newline."""
+        authinfo = tmp_path / ".authinfo"
+        authinfo.write_bytes(b"")
+        assert parse_authinfo(authinfo) == []
+
+        authinfo.write_bytes(
+            b"# comment\r\n"
+            b"machine smtp.example.com login a@example.com password p\xc3\xa4ss\r\n"
+            b"machine imap.example.com port 993 login b@example.com password x"
+        )
+        creds = parse_authinfo(authinfo)
+        assert [c.login for c in creds] == ["a@example.com", "b@example.com"]
+        assert creds[0].password == "päss"
+        assert creds[1].machine == "imap.example.com"
+
+    def test_parse_from_fifo(self, tmp_path):
+        """Test reading credentials from a pipe, as with --authinfo <(gpg -d ...)."""
+        import threading
+
+        fifo = tmp_path / "authinfo.fifo"
+        os.mkfifo(fifo)
+
+        def write():
+            fifo.write_text(
+                "machine smtp.example.com login a@example.com password secret\n"
+            )
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            cred = find_credential_by_email("a@example.com", fifo)
+        finally:
+            writer.join(timeout=5)
+
+        assert cred is not None
+        assert cred.password == "secret"
+
+    def test_default_path_follows_environment(self, tmp_path, monkeypatch):
+        """Test the default .authinfo path is looked up on every call."""
+        from mdmailbox.authinfo import default_authinfo_path
+
+        monkeypatch.delenv("AUTHINFO_FILE", raising=False)
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        assert default_authinfo_path() == tmp_path / ".authinfo"
+
+        monkeypatch.setenv("AUTHINFO_FILE", str(tmp_path / "other"))
+        assert default_authinfo_path() == tmp_path / "other"
+
+    def test_parse_cache_invalidated_on_change(self, tmp_path):
+        """Test that edits to .authinfo are picked up by cached lookups."""
+        authinfo = tmp_path / ".authinfo"
+        authinfo.write_text(
+            "machine smtp.example.com login user@example.com password old\n"
+        )
+
+        cred = find_credential_by_email("user@example.com", authinfo)
+        assert cred.password == "old"
+
+        authinfo.write_text(
+            "machine smtp.example.com login user@example.com password newer\n"
+            "machine smtp.example.com login other@example.com password other\n"
+        )
+
+        cred = find_credential_by_email("user@example.com", authinfo)
+        assert cred.password == "newer"
+        assert len(parse_authinfo(authinfo)) == 2
+
 
 class TestEmailParsing:
     """Tests for Email YAML frontmatter parsing."""
@@ -184,6 +277,80 @@ Hello everyone.
         assert email.to == ["alice@example.com", "bob@example.com"]
         assert email.cc == ["charlie@example.com"]
 
+    def test_parse_interns_addresses(self):
+        """Test that repeated addresses across emails share one string object."""
+        text = """---
+from: sender@example.com
+to: [alice@example.com, 42]
+subject: Interned
+---
+
+Body.
+"""
+        a = Email.from_string(text)
+        b = Email.from_string(text)
+
+        assert a.from_addr is b.from_addr
+        assert a.to[0] is b.to[0]
+        assert a.to[1] == 42  # non-string YAML values are left alone
+
+    def test_parse_blank_recipient_keys(self, tmp_path):
+        """Test blank `to:`/`cc:` keys parse and are reported by validation."""
+        from mdmailbox.validate import validate_email_string, ValidationContext
+
+        text = """---
+from: sender@example.com
+to:
+cc:
+subject: Blank
+---
+
+Body.
+"""
+        email = Email.from_string(text)
+        assert email.to is None
+        assert email.cc is None
+
+        draft = tmp_path / "blank.md"
+        draft.write_text(text)
+        assert Email.from_file(draft).to is None
+
+        ctx = ValidationContext(authinfo_path=tmp_path / "none")
+        result = validate_email_string(text, ctx)
+        assert result.has_errors
+        assert any(i.field == "to" and "required" in i.message for i in result.items)
+
+    def test_parse_delimiter_with_trailing_space_and_body_rule(self):
+        """Test a closing '--- ' isn't skipped in favor of a later '---' line."""
+        text = """---
+from: sender@example.com
+to: recipient@example.com
+subject: Trailing space
+--- \n\nBody above the rule.
+
+---
+# Send Log
+"""
+        email = Email.from_string(text)
+        assert email.subject == "Trailing space"
+        assert email.body.startswith("Body above the rule.")
+        assert "# Send Log" in email.body
+
+    def test_parse_delimiter_inside_header(self):
+        """Test that --- inside a header value doesn't end the frontmatter."""
+        text = """---
+from: sender@example.com
+to: recipient@example.com
+subject: Before --- after
+---
+
+Body.
+"""
+        email = Email.from_string(text)
+
+        assert email.subject == "Before --- after"
+        assert email.body == "Body."
+
     def test_parse_from_file(self, tmp_path):
         email_file = tmp_path / "test.md"
         email_file.write_text("""---
@@ -200,6 +367,29 @@ Body from file.
         assert email.from_addr == "me@example.com"
         assert email.source_path == email_file
 
+    def test_from_file_cache(self, tmp_path):
+        """Test cached file reads return independent copies and see edits."""
+        email_file = tmp_path / "test.md"
+        email_file.write_text("""---
+from: me@example.com
+to: you@example.com
+subject: Version 1
+---
+
+Body.
+""")
+
+        first = Email.from_file(email_file)
+        first.to.append("extra@example.com")
+        first.subject = "Changed"
+
+        second = Email.from_file(email_file)
+        assert second.to == ["you@example.com"]
+        assert second.subject == "Version 1"
+
+        email_file.write_text(email_file.read_text().replace("Version 1", "Version 2!"))
+        assert Email.from_file(email_file).subject == "Version 2!"
+
     def test_to_mime_conversion(self):
         text = """---
 from: sender@example.com
@@ -218,6 +408,58 @@ Plain text body.
         assert "Message-ID" in mime
         assert "Date" in mime
 
+    def test_to_mime_headers_encoded(self):
+        """Test plain, non-ASCII and long headers all serialize correctly."""
+        long_subject = "Quarterly planning " * 6
+        email = Email(
+            from_addr="Jörg Müller <joerg@example.com>",
+            to=["alice@example.com"],
+            subject="Grüße",
+            body="Body.",
+            references=["<a@example.com>", "<b@example.com>"],
+        )
+        mime = email.to_mime()
+        assert mime["Subject"] == "Grüße"
+        assert mime["References"] == "<a@example.com> <b@example.com>"
+        assert b"Subject: =?utf-8?" in mime.as_bytes()
+
+        email.subject = long_subject
+        raw = email.to_mime().as_bytes()
+        assert max(len(line) for line in raw.split(b"\n")) <= 78
+        assert email.to_mime()["Subject"] == long_subject
+
+    def test_to_mime_message_id(self):
+        """Test generated Message-IDs are well-formed and unique; set ones are kept."""
+        email = Email(
+            from_addr="sender@example.com", to=["r@example.com"], subject="S", body="B"
+        )
+        ids = {str(email.to_mime()["Message-ID"]) for _ in range(3)}
+        assert len(ids) == 3
+        assert all(i.startswith("<") and i.endswith(">") and "@" in i for i in ids)
+
+        email.message_id = "<fixed@example.com>"
+        assert email.to_mime()["Message-ID"] == "<fixed@example.com>"
+
+    def test_roundtrip_emoji(self, tmp_path):
+        """Test characters outside the BMP are written literally, not escaped."""
+        email = Email(
+            from_addr="Ann 🌸 <a@example.com>",
+            to=["b@example.com"],
+            subject="Party 🎉 tonight",
+            body="See you 🎈",
+        )
+        path = tmp_path / "emoji.md"
+        email.save(path)
+
+        text = path.read_text()
+        assert "subject: Party 🎉 tonight" in text
+        assert "Ann 🌸 <a@example.com>" in text
+        assert "\\U" not in text
+
+        loaded = Email.from_file(path)
+        assert loaded.subject == "Party 🎉 tonight"
+        assert loaded.from_addr == "Ann 🌸 <a@example.com>"
+
     def test_roundtrip(self):
         original = """---
 from: sender@example.com
@@ -458,6 +700,172 @@ This email has a display name in the from field.
         assert msg["From"] == "John Smith <sender@example.com>"
         assert msg["To"] == "recipient@example.com"
 
+    def test_session_reuses_connection(self, smtpd):
+        """Test that SmtpSession sends several emails over one connection."""
+        credential = Credential(
+            machine=smtpd.hostname,
+            login="sender@example.com",
+            password="testpass",
+        )
+
+        results = []
+        with SmtpSession() as session:
+            for i in range(3):
+                email = Email.from_string(f"""---
+from: sender@example.com
+to: recipient@example.com
+subject: Session Test {i}
+---
+
+Message {i}.
+""")
+                results.append(
+                    session.send(
+                        email, credential=credential, port=smtpd.port, use_tls=False
+                    )
+                )
+
+        assert all(r.success for r in results)
+        assert len(smtpd.messages) == 3
+        assert sum("Connecting to" in line for r in results for line in r.log) == 1
+        assert any("Reusing connection" in line for line in results[-1].log)
+
+    def test_session_reconnects_dropped_idle_connection(self, smtpd):
+        """Test a cached connection that died while idle is replaced before sending."""
+        import socket
+
+        credential = Credential(
+            machine=smtpd.hostname,
+            login="sender@example.com",
+            password="testpass",
+        )
+        email = Email.from_string("""---
+from: sender@example.com
+to: recipient@example.com
+subject: Reconnect
+---
+
+Body.
+""")
+
+        with SmtpSession() as session:
+            first = session.send(
+                email, credential=credential, port=smtpd.port, use_tls=False
+            )
+            for server in session._conns.values():
+                server.sock.shutdown(socket.SHUT_RDWR)
+            second = session.send(
+                email, credential=credential, port=smtpd.port, use_tls=False
+            )
+
+        assert first.success and second.success, second.message
+        assert any("reconnecting" in line for line in second.log)
+        assert len(smtpd.messages) == 2
+
+    def test_send_pipelined(self, pipelining_smtpd):
+        """Test sending when the server offers PIPELINING."""
+        handler = pipelining_smtpd.handler
+        email = Email.from_string(f"""---
+from: sender@example.com
+to:
+  - alice@example.com
+  - {handler.refused}
+cc: bob@example.com
+subject: Pipelined
+---
+
+.leading dot
+Body.
+""")
+
+        credential = Credential(
+            machine=pipelining_smtpd.hostname,
+            login="sender@example.com",
+            password="testpass",
+        )
+
+        result = send_email(
+            email, credential=credential, port=pipelining_smtpd.port, use_tls=False
+        )
+
+        assert result.success, result.message
+        assert any("PIPELINING" in line for line in result.log)
+        assert handler.refused in result.smtp_response
+
+        assert len(handler.envelopes) == 1
+        envelope = handler.envelopes[0]
+        assert envelope.mail_from == "sender@example.com"
+        assert envelope.rcpt_tos == ["alice@example.com", "bob@example.com"]
+        assert b"\r\n.leading dot\r\n" in envelope.original_content
+
+    def test_send_pipelined_421_closes(self, pipelining_smtpd):
+        """Test a pipelined 421 reply raises like smtplib and closes the connection."""
+        import smtplib
+
+        from mdmailbox.smtp import _SMTP
+
+        handler = pipelining_smtpd.handler
+        server = _SMTP(pipelining_smtpd.hostname, pipelining_smtpd.port)
+        server.ehlo()
+        assert server.has_extn("pipelining")
+
+        with pytest.raises(smtplib.SMTPRecipientsRefused) as excinfo:
+            server.sendmail(
+                "sender@example.com",
+                ["alice@example.com", handler.shutting_down, "bob@example.com"],
+                b"Subject: x\r\n\r\nBody.\r\n",
+            )
+
+        assert excinfo.value.recipients == {
+            handler.shutting_down: (421, b"Service shutting down")
+        }
+        assert server.sock is None
+        assert handler.envelopes == []
+
+    def test_send_chunked(self, chunking_smtpd):
+        """Test sending with BDAT when the server offers CHUNKING."""
+        handler = chunking_smtpd.handler
+        email = Email.from_string(f"""---
+from: sender@example.com
+to:
+  - alice@example.com
+  - {handler.refused}
+subject: Chunked
+---
+
+.leading dot
+Body.
+""")
+
+        credential = Credential(
+            machine=chunking_smtpd.hostname,
+            login="sender@example.com",
+            password="testpass",
+        )
+
+        result = send_email(
+            email, credential=credential, port=chunking_smtpd.port, use_tls=False
+        )
+
+        assert result.success, result.message
+        assert any("CHUNKING" in line for line in result.log)
+        assert handler.refused in result.smtp_response
+
+        assert len(handler.envelopes) == 1
+        envelope = handler.envelopes[0]
+        assert envelope.rcpt_tos == ["alice@example.com"]
+        # BDAT sends the message as-is: no dot-stuffing, no terminator
+        assert b"\r\n.leading dot\r\n" in envelope.original_content
+        assert b"Subject: Chunked" in envelope.original_content
+
+        # A message with only refused recipients fails cleanly
+        email.to = [handler.refused]
+        result = send_email(
+            email, credential=credential, port=chunking_smtpd.port, use_tls=False
+        )
+        assert not result.success
+        assert len(handler.envelopes) == 1
+
 
 class TestImporter:
     """Tests for Maildir import functionality."""
@@ -569,6 +977,100 @@ Hi Bob, how are you?
         assert email.account == "test-account"
         assert email.original_hash is not None
 
+    def test_parse_window_bounds_submitted_work(self):
+        """Test parallel parsing submits inputs in bounded windows, in order."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from mdmailbox.importer import _map_windowed
+
+        consumed = 0
+
+        def inputs():
+            nonlocal consumed
+            for i in range(50):
+                consumed += 1
+                yield i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = []
+            for result in _map_windowed(executor, lambda x: x * x, 5, inputs()):
+                assert consumed - len(results) <= 2 * 5
+                results.append(result)
+
+        assert results == [i * i for i in range(50)]
+
+    def test_import_fsync_opt_in(self, tmp_path, monkeypatch):
+        """Test files are only fsynced when asked for."""
+        account_dir = tmp_path / "mail" / "test-account" / "INBOX" / "cur"
+        account_dir.mkdir(parents=True)
+        for i in range(3):
+            (account_dir / f"{i}.test:2,S").write_bytes(
+                f"From: a@example.com\nTo: b@example.com\nSubject: S{i}\n\nHi.\n".encode()
+            )
+
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(
+            "mdmailbox.importer.os.fsync", lambda fd: synced.append(real_fsync(fd))
+        )
+
+        import_maildir(tmp_path / "mail", tmp_path / "fast", jobs=1)
+        assert synced == []
+
+        created = import_maildir(tmp_path / "mail", tmp_path / "durable", jobs=1, fsync=True)
+        assert len(created) == 3
+        assert len(synced) == 3 + 1  # one per file, one for the directory
+
+    def test_import_handles_short_writes(self, tmp_path, monkeypatch):
+        """Test imported files are complete even when writev writes partially."""
+        account_dir = tmp_path / "mail" / "test-account" / "INBOX" / "cur"
+        account_dir.mkdir(parents=True)
+        (account_dir / "1.test:2,S").write_bytes(
+            "From: alice@example.com\nTo: bob@example.com\nSubject: Grüße\n"
+            "Content-Type: text/plain; charset=utf-8\n\nSchöne Grüße.\n".encode()
+        )
+
+        real_writev = os.writev
+        monkeypatch.setattr(
+            "mdmailbox.importer.os.writev",
+            lambda fd, buffers: real_writev(fd, [bytes(buffers[0][:5])]),
+        )
+        created = import_maildir(tmp_path / "mail", tmp_path / "output")
+
+        email = Email.from_file(created[0])
+        assert email.subject == "Grüße"
+        assert created[0].read_bytes() == b"".join(email.to_parts())
+        assert created[0].read_text() == email.to_string()
+
+    def test_cli_import_parallel(self, tmp_path):
+        """Test import large enough to use parser processes."""
+        maildir = tmp_path / "mail"
+        account_dir = maildir / "test-account" / "INBOX" / "cur"
+        account_dir.mkdir(parents=True)
+
+        for i in range(70):
+            (account_dir / f"{i}.test:2,S").write_bytes(f"""From: alice@example.com
+To: bob@example.com
+Subject: Message {i}
+Message-ID: <msg{i}@example.com>
+Date: Wed, 22 Jan 2025 15:00:00 +0000
+
+Body {i}.
+""".encode())
+
+        output_dir = tmp_path / "output"
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            ["import", "--maildir", str(maildir), "-o", str(output_dir), "-j", "2"],
+        )
+
+        assert result.exit_code == 0, result.output
+        subjects = sorted(
+            Email.from_file(p).subject for p in output_dir.glob("*.md")
+        )
+        assert subjects == sorted(f"Message {i}" for i in range(70))
+
 
 class TestCLI:
     """Tests for CLI entry points."""
@@ -586,6 +1088,35 @@ class TestCLI:
         result = runner.invoke(main, ["--version"])
         assert result.exit_code == 0
 
+    def test_cli_help_skips_heavy_imports(self):
+        """Test that --help doesn't import yaml, smtplib or the email parser."""
+        code = (
+            "import sys\n"
+            "from click.testing import CliRunner\n"
+            "from mdmailbox.cli import main\n"
+            "assert CliRunner().invoke(main, ['--help']).exit_code == 0\n"
+            "heavy = ['yaml', 'smtplib', 'imaplib', 'email.parser']\n"
+            "print(' '.join(m for m in heavy if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
+
+    def test_audit_trail_values_roundtrip(self):
+        """Test audit-trail scalars load back from YAML as the same strings."""
+        import yaml
+
+        from mdmailbox.cli import _yaml_str
+
+        values = [
+            '250 2.0.0 Ok: queued as "ABC" \\ id\nsecond line\r\tend',
+            "-", "250", "true", "null", "0x1f", "1:30", "", "smtp.example.com",
+        ]
+        for value in values:
+            loaded = yaml.safe_load(f"smtp-response: {_yaml_str(value)}")
+            assert loaded == {"smtp-response": value}
+
     def test_cli_send_dry_run(self, tmp_path):
         """Test send --dry-run command with validation preview."""
         # Create authinfo for credential validation
@@ -680,6 +1211,23 @@ Sent with --force.
         # Should have sent
         assert len(smtpd.messages) == 1
 
+    def test_cli_send_force_requires_headers(self, tmp_path):
+        """Test --force still refuses to send without required headers."""
+        email_file = tmp_path / "test.md"
+        email_file.write_text("""---
+from: sender@example.com
+---
+
+No recipient or subject.
+""")
+
+        runner = CliRunner()
+        result = runner.invoke(main, ["send", "--force", str(email_file)])
+
+        assert result.exit_code == 1
+        assert "Missing required headers: to, subject" in result.output
+        assert email_file.exists()
+
     def test_cli_send_yes_autoconfirms(self, smtpd, tmp_path, monkeypatch):
         """Test --yes flag auto-confirms after validation."""
         # Create fake home for sent folder
@@ -725,6 +1273,51 @@ Sent with --yes.
         # Should have sent without prompting
         assert len(smtpd.messages) == 1
 
+    def test_cli_send_multiple_files(self, smtpd, tmp_path, monkeypatch):
+        """Test sending several files in one invocation."""
+        fake_home = tmp_path / "home"
+        fake_home.mkdir()
+        monkeypatch.setattr(Path, "home", lambda: fake_home)
+
+        authinfo = tmp_path / ".authinfo"
+        authinfo.write_text(
+            f"machine {smtpd.hostname} login sender@example.com password testpass\n"
+        )
+
+        files = []
+        for i in range(2):
+            email_file = tmp_path / f"draft{i}.md"
+            email_file.write_text(f"""---
+from: sender@example.com
+to: recipient@example.com
+subject: Batch {i}
+---
+
+Message {i}.
+""")
+            files.append(str(email_file))
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main,
+            [
+                "send",
+                "--yes",
+                "--authinfo",
+                str(authinfo),
+                "--port",
+                str(smtpd.port),
+                "--no-tls",
+                *files,
+            ],
+        )
+
+        assert result.exit_code == 0, f"output: {result.output}"
+        assert len(smtpd.messages) == 2
+        assert result.output.count("Sent: Batch") == 2
+        assert not any(Path(f).exists() for f in files)
+        assert len(list((fake_home / "Mdmailbox" / "sent").glob("*.md"))) == 2
+
     def test_cli_send_yes_fails_on_errors(self, tmp_path):
         """Test --yes flag still fails on validation errors."""
         email_file = tmp_path / "test.md"